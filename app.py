@@ -1,8 +1,9 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context
 from matching_system import ResumeMatchingSystem
+from change_log import ChangeLog
+from datetime import datetime
 import os
-import json
-import pandas as pd
+import atexit
 
 app = Flask(__name__)
 app.secret_key = 'resume_matching_app_secret_key'
@@ -28,6 +29,19 @@ if os.path.exists(job_file):
 if os.path.exists(skill_file):
     matching_system.load_skill_relationships_from_csv(skill_file)
 
+# Replay changes made since the last snapshot
+change_log = ChangeLog(os.path.join(data_dir, 'changes.log'), candidate_file, job_file, skill_file)
+replayed = change_log.replay(matching_system)
+if replayed:
+    print(f"Replayed {replayed} changes from {change_log.path}")
+# Fold a log that outgrew the snapshot into fresh CSV files in the background
+change_log.maybe_compact(matching_system)
+atexit.register(change_log.close)
+
+def apply_change(op, **fields):
+    """Write a change to the log before applying it to the matching system."""
+    change_log.append_and_apply(matching_system, op, fields)
+
 @app.route('/')
 def index():
     stats = {
@@ -56,8 +70,10 @@ def candidates():
             experience_years = int(request.form.get('experience_years', 0))
             salary_expectation = float(request.form.get('salary_expectation', 0))
             
-            matching_system.add_candidate(
-                candidate_id, name, skills_dict, experience_years, salary_expectation
+            apply_change(
+                'add_candidate', id=candidate_id, name=name, skills=skills_dict,
+                experience_years=experience_years, salary_expectation=salary_expectation,
+                application_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             )
             flash('Candidate added successfully!', 'success')
         except Exception as e:
@@ -68,11 +84,9 @@ def candidates():
 @app.route('/candidates/delete/<int:candidate_id>', methods=['POST'])
 def delete_candidate(candidate_id):
     # Find and remove candidate
-    for i, candidate in enumerate(matching_system.candidates):
-        if candidate['id'] == candidate_id:
-            matching_system.candidates.pop(i)
-            flash('Candidate deleted successfully!', 'success')
-            break
+    if any(candidate['id'] == candidate_id for candidate in matching_system.candidates):
+        apply_change('delete_candidate', id=candidate_id)
+        flash('Candidate deleted successfully!', 'success')
     return redirect(url_for('candidates'))
 
 @app.route('/jobs', methods=['GET', 'POST'])
@@ -97,7 +111,10 @@ def jobs():
             max_salary = float(request.form.get('max_salary', 0))
             salary_range = (min_salary, max_salary)
             
-            matching_system.add_job(job_id, title, required_skills, weights, salary_range)
+            apply_change(
+                'add_job', id=job_id, title=title, required_skills=required_skills,
+                importance_weights=weights, salary_range=salary_range
+            )
             flash('Job added successfully!', 'success')
         except Exception as e:
             flash(f'Error adding job: {str(e)}', 'danger')
@@ -107,11 +124,9 @@ def jobs():
 @app.route('/jobs/delete/<int:job_id>', methods=['POST'])
 def delete_job(job_id):
     # Find and remove job
-    for i, job in enumerate(matching_system.jobs):
-        if job['id'] == job_id:
-            matching_system.jobs.pop(i)
-            flash('Job deleted successfully!', 'success')
-            break
+    if any(job['id'] == job_id for job in matching_system.jobs):
+        apply_change('delete_job', id=job_id)
+        flash('Job deleted successfully!', 'success')
     return redirect(url_for('jobs'))
 
 @app.route('/skills', methods=['GET', 'POST'])
@@ -122,7 +137,7 @@ def skills():
             skill2 = request.form.get('skill2')
             weight = float(request.form.get('weight', 1.0))
             
-            matching_system.add_skill_relationship(skill1, skill2, weight)
+            apply_change('add_skill_relationship', skill1=skill1, skill2=skill2, weight=weight)
             flash('Skill relationship added successfully!', 'success')
         except Exception as e:
             flash(f'Error adding skill relationship: {str(e)}', 'danger')
@@ -160,8 +175,8 @@ def matching():
     # Calculate suitability scores
     matching_system.calculate_suitability_scores()
     
-    # Find optimal matches
-    matches = matching_system.find_optimal_matches()
+    # Find optimal matches, reusing the previous assignment where possible
+    matches = matching_system.find_incremental_matches()
     
     # Generate report
     report_df = matching_system.generate_report(matches)
@@ -189,50 +204,34 @@ def matching():
         matching_system=matching_system  # Add this line to pass the matching_system to the template
     )
 
+@app.route('/export_suitability')
+def export_suitability():
+    fmt = request.args.get('format', 'csv')
+    compress = request.args.get('gzip', '0') in ('1', 'true', 'yes')
+    
+    try:
+        threshold = request.args.get('threshold')
+        threshold = float(threshold) if threshold else None
+        chunks = matching_system.iter_suitability_export(fmt=fmt, threshold=threshold, compress=compress)
+    except ValueError as e:
+        flash(f'Error exporting suitability scores: {str(e)}', 'danger')
+        return redirect(url_for('matching'))
+    
+    # Stream the export block by block instead of building the whole file in memory
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'text/csv'
+    filename = f"suitability_scores.{'ndjson' if fmt == 'ndjson' else 'csv'}"
+    if compress:
+        mimetype = 'application/gzip'
+        filename += '.gz'
+    
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 @app.route('/save_data', methods=['POST'])
 def save_data():
     try:
-        # Save candidates to CSV - properly serialize complex data
-        if matching_system.candidates:
-            # Create a copy of candidates with serialized fields
-            serialized_candidates = []
-            for candidate in matching_system.candidates:
-                c = candidate.copy()
-                # Convert datetime to string
-                if 'application_date' in c:
-                    c['application_date'] = c['application_date'].strftime('%Y-%m-%d %H:%M:%S')
-                # Convert skills to JSON string
-                if 'skills' in c:
-                    c['skills'] = json.dumps(c['skills'])
-                serialized_candidates.append(c)
-            
-            candidate_df = pd.DataFrame(serialized_candidates)
-            candidate_df.to_csv(candidate_file, index=False)
-            print(f"Saved {len(serialized_candidates)} candidates to {candidate_file}")
-        
-        # Save jobs to CSV - convert dictionaries to string format
-        if matching_system.jobs:
-            jobs_data = []
-            for job in matching_system.jobs:
-                job_dict = job.copy()
-                job_dict['required_skills'] = json.dumps(job_dict['required_skills'])
-                job_dict['importance_weights'] = json.dumps(job_dict['importance_weights'])
-                job_dict['salary_range'] = str(job_dict['salary_range'])
-                jobs_data.append(job_dict)
-            
-            job_df = pd.DataFrame(jobs_data)
-            job_df.to_csv(job_file, index=False)
-            print(f"Saved {len(jobs_data)} jobs to {job_file}")
-        
-        # Save skill relationships to CSV
-        if matching_system.skill_graph.number_of_edges() > 0:
-            skill_data = []
-            for u, v, data in matching_system.skill_graph.edges(data=True):
-                skill_data.append([u, v, data.get('weight', 1.0)])
-            
-            skill_df = pd.DataFrame(skill_data, columns=['skill1', 'skill2', 'weight'])
-            skill_df.to_csv(skill_file, index=False)
-            print(f"Saved {len(skill_data)} skill relationships to {skill_file}")
+        # Changes are already journaled, so saving only has to make them durable
+        change_log.sync()
         
         flash('Data saved successfully!', 'success')
     except Exception as e:
@@ -0,0 +1,65 @@
+"""Compare single-edit warm starts of IncrementalAssignment with a cold linear_sum_assignment.
+
+Run with ``python benchmark_incremental_assignment.py``. Times are medians in milliseconds.
+"""
+import statistics
+import time
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from incremental_assignment import IncrementalAssignment
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def random_scores(rng, shape, threshold):
+    # Shaped like -gain in find_incremental_matches: below-threshold scores count as zero
+    scores = rng.integers(0, 60, shape).astype(float)
+    return -np.where(scores >= threshold, scores, 0)
+
+
+def run(n, threshold, seed):
+    rng = np.random.default_rng(seed)
+    costs = random_scores(rng, (n, n), threshold)
+    rows = list(range(n))
+    cols = list(range(n, 2 * n))
+    matcher = IncrementalAssignment()
+    times = {
+        'cold scipy': timed(lambda: linear_sum_assignment(costs)),
+        'cold build': timed(lambda: matcher.sync(costs, rows, cols)),
+        'no change': timed(lambda: matcher.sync(costs, rows, cols)),
+    }
+
+    costs = np.vstack([costs, random_scores(rng, (1, n), threshold)])
+    rows = rows + [2 * n]
+    times['add row'] = timed(lambda: matcher.sync(costs, rows, cols))
+
+    costs = np.delete(costs, n // 2, axis=0)
+    rows = rows[:n // 2] + rows[n // 2 + 1:]
+    times['remove row'] = timed(lambda: matcher.sync(costs, rows, cols))
+
+    costs = costs.copy()
+    costs[7] = random_scores(rng, n, threshold)
+    times['rescore row'] = timed(lambda: matcher.sync(costs, rows, cols))
+
+    costs = costs.copy()
+    costs[:, 9] = random_scores(rng, len(rows), threshold)
+    times['rescore column'] = timed(lambda: matcher.sync(costs, rows, cols))
+
+    result_rows, result_cols = linear_sum_assignment(costs)
+    assert np.isclose(matcher.total_cost(), costs[result_rows, result_cols].sum())
+    return times
+
+
+if __name__ == '__main__':
+    for n in (400, 1000, 2000):
+        for threshold in (0, 40):
+            runs = [run(n, threshold, seed) for seed in range(5)]
+            medians = {name: statistics.median(r[name] for r in runs) for name in runs[0]}
+            print(f"n={n:<5} threshold={threshold:<3} " +
+                  "  ".join(f"{name}={ms:.1f}" for name, ms in medians.items()))
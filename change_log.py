@@ -0,0 +1,244 @@
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+
+class ChangeLog:
+    """Append-only journal of data changes, replayed on top of the last CSV snapshot.
+
+    Every change is written as one JSON line before it is applied in memory, so
+    saving only costs the changes made since the last save. Appends are flushed
+    to the OS immediately and fsynced in batches, either once ``sync_every``
+    changes are pending or by a background thread at most ``sync_interval``
+    seconds after a change.
+
+    Once the log outgrows the snapshot (``compact_ratio`` times its size, and at
+    least ``min_compact_bytes``) or holds ``compact_every`` changes, it is compacted: the log is rotated, a fresh
+    snapshot is written in a background thread and the rotated log is dropped.
+    Tying compaction to the snapshot size keeps its cost proportional to the
+    changes that triggered it. Replaying is idempotent (adds replace records with
+    the same ID), so a log can safely be replayed over a snapshot that already
+    contains some of it.
+    """
+
+    def __init__(self, path, candidate_file, job_file, skill_file, sync_every=32, sync_interval=1.0,
+                 compact_ratio=1.0, min_compact_bytes=64 * 1024, compact_every=10000):
+        self.path = path
+        self.old_path = path + '.old'  # Rotated log waiting for its snapshot to be written
+        self.candidate_file = candidate_file
+        self.job_file = job_file
+        self.skill_file = skill_file
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._file = open(self.path, mode='a', encoding='utf-8')
+        self._terminate_partial_line()
+        self._pending = 0
+        self._logged = 0  # Changes in the rotated and current logs
+        self._last_sync = time.monotonic()
+        self._compaction = None
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_periodically, daemon=True)
+        self._syncer.start()
+
+    def _terminate_partial_line(self):
+        # Otherwise the next change would be glued onto a line cut short by a crash
+        with open(self.path, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() == 0:
+                return
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b'\n':
+                self._file.write('\n')
+                self._file.flush()
+
+    def append(self, op, **fields):
+        """Write a change to the log, fsyncing once enough changes or time have piled up."""
+        with self._lock:
+            self._write(op, fields)
+
+    def append_and_apply(self, matching_system, op, fields):
+        """Write a change to the log and apply it to the matching system as one step.
+
+        Holding the lock across both keeps a compaction from snapshotting the data
+        without the change after its log line has already been rotated away. Adds
+        for an ID that already exists are rejected with a ValueError before anything
+        is written, since replaying them would silently replace the existing record.
+        """
+        with self._lock:
+            if op == 'add_candidate' and any(c['id'] == fields['id'] for c in matching_system.candidates):
+                raise ValueError(f"a candidate with ID {fields['id']} already exists")
+            if op == 'add_job' and any(j['id'] == fields['id'] for j in matching_system.jobs):
+                raise ValueError(f"a job with ID {fields['id']} already exists")
+            self._write(op, fields)
+            self.apply(matching_system, op, fields)
+            self._maybe_compact(matching_system)
+
+    def maybe_compact(self, matching_system):
+        """Compact the log if it has outgrown the snapshot, returning whether a compaction was started."""
+        with self._lock:
+            return self._maybe_compact(matching_system)
+
+    def _maybe_compact(self, matching_system):
+        if not self._needs_compaction():
+            return False
+        try:
+            self._compact(matching_system)
+            return True
+        except Exception as e:
+            # The change itself is logged and applied; compaction is retried on the next one
+            print(f"Error compacting change log: {e}")
+            return False
+
+    def _needs_compaction(self):
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+        if self._logged >= self.compact_every:
+            return True
+        log_bytes = os.fstat(self._file.fileno()).st_size
+        snapshot_bytes = sum(os.path.getsize(f) for f in (self.candidate_file, self.job_file, self.skill_file)
+                             if os.path.exists(f))
+        return log_bytes >= max(self.min_compact_bytes, self.compact_ratio * snapshot_bytes)
+
+    def _write(self, op, fields):
+        self._file.write(json.dumps({'op': op, **fields}) + '\n')
+        self._file.flush()
+        self._pending += 1
+        self._logged += 1
+        if (self._pending >= self.sync_every or
+                time.monotonic() - self._last_sync >= self.sync_interval):
+            self._sync()
+
+    def _sync_periodically(self):
+        # Bounds how long a change can sit un-fsynced when no further changes come in
+        while not self._closed.wait(self.sync_interval):
+            with self._lock:
+                if self._pending and not self._file.closed:
+                    self._sync()
+
+    def sync(self):
+        """Force all logged changes to disk."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def replay(self, matching_system):
+        """Apply the rotated and current logs to the matching system, returning the number of changes."""
+        count = 0
+        for path in (self.old_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, mode='r', encoding='utf-8') as file:
+                for line_number, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        change = json.loads(line)
+                        self.apply(matching_system, change.pop('op'), change)
+                        count += 1
+                    except Exception as e:
+                        # A crash mid-append can leave a partial last line behind
+                        print(f"Skipping change {line_number} in {path}: {e}")
+        self._logged += count
+        return count
+
+    @staticmethod
+    def apply(matching_system, op, fields):
+        """Apply a single logged change to the matching system."""
+        if op == 'add_candidate':
+            matching_system.remove_candidate(fields['id'])
+            matching_system.add_candidate(
+                fields['id'], fields['name'], fields['skills'], fields['experience_years'],
+                fields['salary_expectation'],
+                datetime.strptime(fields['application_date'], '%Y-%m-%d %H:%M:%S')
+            )
+        elif op == 'delete_candidate':
+            matching_system.remove_candidate(fields['id'])
+        elif op == 'add_job':
+            salary_range = fields['salary_range']
+            matching_system.remove_job(fields['id'])
+            matching_system.add_job(
+                fields['id'], fields['title'], fields['required_skills'],
+                fields['importance_weights'], tuple(salary_range) if salary_range else None
+            )
+        elif op == 'delete_job':
+            matching_system.remove_job(fields['id'])
+        elif op == 'add_skill_relationship':
+            matching_system.add_skill_relationship(fields['skill1'], fields['skill2'], fields['weight'])
+        else:
+            raise ValueError(f"Unknown change: {op}")
+
+    def compact(self, matching_system):
+        """Start writing a snapshot in the background and drop the log it covers.
+
+        Returns False if a compaction is already running.
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return False
+            self._compact(matching_system)
+            return True
+
+    def _compact(self, matching_system):
+        # Shallow copies are enough: records are replaced, never modified in place
+        candidates = list(matching_system.candidates)
+        jobs = list(matching_system.jobs)
+        edges = list(matching_system.skill_graph.edges(data='weight', default=1.0))
+
+        self._sync()
+        self._file.close()
+        try:
+            if os.path.exists(self.old_path):
+                # An earlier compaction didn't finish, keep its changes ahead of ours
+                with open(self.path, 'rb') as src, open(self.old_path, 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.old_path)
+        finally:
+            # Reopen even if the rotation failed, so later changes can still be logged
+            self._file = open(self.path, mode='a', encoding='utf-8')
+        self._logged = 0
+
+        self._compaction = threading.Thread(
+            target=self._write_snapshot, args=(matching_system, candidates, jobs, edges), daemon=True
+        )
+        self._compaction.start()
+
+    def _write_snapshot(self, matching_system, candidates, jobs, edges):
+        try:
+            matching_system.save_candidates_to_csv(self.candidate_file, candidates)
+            matching_system.save_jobs_to_csv(self.job_file, jobs)
+            matching_system.save_skill_relationships_to_csv(self.skill_file, edges)
+            os.remove(self.old_path)
+            print(f"Compacted change log into snapshot of {len(candidates)} candidates, "
+                  f"{len(jobs)} jobs and {len(edges)} skill relationships")
+        except Exception as e:
+            # The rotated log is kept, so the next startup or compaction still has the changes
+            print(f"Error compacting change log: {e}")
+
+    def wait_for_compaction(self, timeout=None):
+        """Block until a running compaction has finished."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join(timeout)
+
+    def close(self):
+        """Sync and close the log."""
+        self._closed.set()
+        with self._lock:
+            self._sync()
+            self._file.close()
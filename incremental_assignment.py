@@ -0,0 +1,428 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+class IncrementalAssignment:
+    """Linear assignment solver that repairs its previous solution after small edits.
+
+    The solver keeps a square cost matrix (real rows/columns padded with zero-cost
+    dummies), the current assignment and the dual potentials ``u``/``v`` with
+    ``cost[i, j] - u[i] - v[j] >= 0`` everywhere and ``== 0`` on assigned pairs.
+    Adding, removing or rescoring a row or column only breaks a few assigned
+    pairs, which are then re-matched with shortest augmenting paths instead of
+    re-solving the whole problem. The result has the same total cost as a cold
+    ``scipy.optimize.linear_sum_assignment`` on the real rows and columns.
+    """
+
+    def __init__(self):
+        self._cost = np.zeros((0, 0))
+        self._u = np.zeros(0)
+        self._v = np.zeros(0)
+        self._col4row = np.zeros(0, dtype=int)
+        self._row4col = np.zeros(0, dtype=int)
+        self._row_keys = []  # None marks a dummy row
+        self._col_keys = []  # None marks a dummy column
+        self._row_index = {}
+        self._col_index = {}
+        self._synced = None  # (matrix, row keys, col keys) from the last sync, for diffing
+
+    @property
+    def row_keys(self):
+        """Keys of the real rows, in the order expected by ``add_col``/``update_col``."""
+        return [key for key in self._row_keys if key is not None]
+
+    @property
+    def col_keys(self):
+        """Keys of the real columns, in the order expected by ``add_row``/``update_row``."""
+        return [key for key in self._col_keys if key is not None]
+
+    def add_row(self, key, costs):
+        """Add a row whose costs are aligned with ``col_keys``."""
+        if key is None or key in self._row_index:
+            raise ValueError(f"Row key {key!r} is missing or already present")
+        row = self._expand_row(costs)
+
+        dummy_rows = [i for i, k in enumerate(self._row_keys) if k is None]
+        if dummy_rows:
+            i = dummy_rows[0]
+        else:
+            i = self._grow()
+            row = np.append(row, 0.0)
+        self._row_keys[i] = key
+        self._row_index[key] = i
+        self._synced = None
+        self._set_row(i, row)
+        self._repair()
+
+    def add_col(self, key, costs):
+        """Add a column whose costs are aligned with ``row_keys``."""
+        if key is None or key in self._col_index:
+            raise ValueError(f"Column key {key!r} is missing or already present")
+        col = self._expand_col(costs)
+
+        dummy_cols = [j for j, k in enumerate(self._col_keys) if k is None]
+        if dummy_cols:
+            j = dummy_cols[0]
+        else:
+            j = self._grow()
+            col = np.append(col, 0.0)
+        self._col_keys[j] = key
+        self._col_index[key] = j
+        self._synced = None
+        self._set_col(j, col)
+        self._repair()
+
+    def update_row(self, key, costs):
+        """Replace the costs of an existing row (aligned with ``col_keys``)."""
+        i = self._row_index[key]
+        self._synced = None
+        self._set_row(i, self._expand_row(costs))
+        self._repair()
+
+    def update_col(self, key, costs):
+        """Replace the costs of an existing column (aligned with ``row_keys``)."""
+        j = self._col_index[key]
+        self._synced = None
+        self._set_col(j, self._expand_col(costs))
+        self._repair()
+
+    def remove_row(self, key):
+        """Remove a row, turning its slot into a dummy."""
+        i = self._row_index.pop(key)
+        self._synced = None
+        self._row_keys[i] = None
+        self._set_row(i, np.zeros(len(self._col_keys)))
+        self._compact()
+        self._repair()
+
+    def remove_col(self, key):
+        """Remove a column, turning its slot into a dummy."""
+        j = self._col_index.pop(key)
+        self._synced = None
+        self._col_keys[j] = None
+        self._set_col(j, np.zeros(len(self._row_keys)))
+        self._compact()
+        self._repair()
+
+    def sync(self, cost_matrix, row_keys, col_keys, rebuild_fraction=0.05, copy=True):
+        """Bring the solver up to date with a full cost matrix, applying only the differences.
+
+        The matrix is compared with the one from the previous call. Rows and columns
+        that were added, removed or rescored are repaired one by one; once that would
+        touch more than ``rebuild_fraction`` of the matrix it is solved from scratch.
+        The matrix is kept for the next comparison; pass ``copy=False`` to skip
+        copying it when the caller won't modify it afterwards.
+        """
+        cost_matrix = np.asarray(cost_matrix, dtype=float)
+        row_keys = list(row_keys)
+        col_keys = list(col_keys)
+        if cost_matrix.shape != (len(row_keys), len(col_keys)):
+            raise ValueError("Cost matrix shape does not match the given keys")
+        if len(set(row_keys)) != len(row_keys) or len(set(col_keys)) != len(col_keys):
+            raise ValueError("Row and column keys must be unique")
+        if not np.all(np.isfinite(cost_matrix)):
+            raise ValueError("Costs must be finite")
+
+        if self._synced is None or (not self._row_index and not self._col_index):
+            self._build(cost_matrix.copy() if copy else cost_matrix, row_keys, col_keys)
+            return
+
+        last_matrix, last_rows, last_cols = self._synced
+        row_pos = self._positions(row_keys, last_rows)
+        col_pos = self._positions(col_keys, last_cols)
+        new_rows = [key for key, pos in zip(row_keys, row_pos) if pos < 0]
+        new_cols = [key for key, pos in zip(col_keys, col_pos) if pos < 0]
+        gone_rows = set(last_rows).difference(row_keys)
+        gone_cols = set(last_cols).difference(col_keys)
+
+        changed = self._changed_cells(cost_matrix, last_matrix, row_pos, col_pos)
+        changed_rows = np.flatnonzero(changed.any(axis=1))
+        changed_cols = np.flatnonzero(changed.any(axis=0))
+        if not (new_rows or new_cols or gone_rows or gone_cols or len(changed_rows)):
+            return
+        # A rescored column shows up as one changed cell per row, so repair whichever side is smaller
+        by_rows = len(changed_rows) <= len(changed_cols)
+
+        n_edits = (len(new_rows) + len(new_cols) + len(gone_rows) + len(gone_cols) +
+                   min(len(changed_rows), len(changed_cols)))
+        # Only a changed matrix needs keeping, so a no-op sync copies nothing
+        if copy:
+            cost_matrix = cost_matrix.copy()
+        if n_edits > max(1, rebuild_fraction * max(cost_matrix.shape)):
+            self._build(cost_matrix, row_keys, col_keys)
+            return
+
+        for key in gone_rows:
+            self.remove_row(key)
+        for key in gone_cols:
+            self.remove_col(key)
+
+        row_lookup = {key: i for i, key in enumerate(row_keys)}
+        col_lookup = {key: j for j, key in enumerate(col_keys)}
+        if by_rows:
+            cols = [col_lookup[key] for key in self.col_keys]
+            for i in changed_rows:
+                self.update_row(row_keys[i], cost_matrix[i, cols])
+        else:
+            rows = [row_lookup[key] for key in self.row_keys]
+            for j in changed_cols:
+                self.update_col(col_keys[j], cost_matrix[rows, j])
+
+        rows = [row_lookup[key] for key in self.row_keys]
+        for key in new_cols:
+            self.add_col(key, cost_matrix[rows, col_lookup[key]])
+        cols = [col_lookup[key] for key in self.col_keys]
+        for key in new_rows:
+            self.add_row(key, cost_matrix[row_lookup[key], cols])
+
+        self._synced = (cost_matrix, row_keys, col_keys)
+
+    @staticmethod
+    def _positions(keys, last_keys):
+        """Map each key to its index in ``last_keys``, or -1 if it is new."""
+        last_index = {key: i for i, key in enumerate(last_keys)}
+        return np.array([last_index.get(key, -1) for key in keys], dtype=int)
+
+    @staticmethod
+    def _runs(positions):
+        """Split the kept positions into (new slice, old slice) runs contiguous on both sides."""
+        new = np.flatnonzero(positions >= 0)
+        if not len(new):
+            return []
+        old = positions[new]
+        breaks = np.flatnonzero((np.diff(new) != 1) | (np.diff(old) != 1)) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [len(new)]))
+        return [(slice(new[s], new[e - 1] + 1), slice(old[s], old[e - 1] + 1))
+                for s, e in zip(starts, ends)]
+
+    def _changed_cells(self, cost_matrix, last_matrix, row_pos, col_pos):
+        """Flag the cells of kept rows and columns whose cost differs from the last sync."""
+        changed = np.zeros(cost_matrix.shape, dtype=bool)
+        row_runs = self._runs(row_pos)
+        col_runs = self._runs(col_pos)
+        if len(row_runs) * len(col_runs) <= 64:
+            # Appends and deletes leave a few contiguous blocks, which compare without copying
+            for new_r, old_r in row_runs:
+                for new_c, old_c in col_runs:
+                    changed[new_r, new_c] = cost_matrix[new_r, new_c] != last_matrix[old_r, old_c]
+        else:
+            kept_rows = np.flatnonzero(row_pos >= 0)
+            kept_cols = np.flatnonzero(col_pos >= 0)
+            changed[np.ix_(kept_rows, kept_cols)] = (
+                cost_matrix[np.ix_(kept_rows, kept_cols)] !=
+                last_matrix[np.ix_(row_pos[kept_rows], col_pos[kept_cols])]
+            )
+        return changed
+
+    def assignment(self):
+        """Return the assigned ``(row_key, col_key)`` pairs between real rows and columns."""
+        pairs = []
+        for i, row_key in enumerate(self._row_keys):
+            j = self._col4row[i]
+            if row_key is not None and self._col_keys[j] is not None:
+                pairs.append((row_key, self._col_keys[j]))
+        return pairs
+
+    def total_cost(self):
+        """Return the total cost of the current assignment."""
+        if not len(self._col4row):
+            return 0.0
+        return float(self._cost[np.arange(len(self._col4row)), self._col4row].sum())
+
+    def _expand_row(self, costs):
+        costs = np.asarray(costs, dtype=float)
+        real = [j for j, k in enumerate(self._col_keys) if k is not None]
+        if costs.shape != (len(real),):
+            raise ValueError("Row costs must have one entry per column")
+        if not np.all(np.isfinite(costs)):
+            raise ValueError("Costs must be finite")
+        row = np.zeros(len(self._col_keys))
+        row[real] = costs
+        return row
+
+    def _expand_col(self, costs):
+        costs = np.asarray(costs, dtype=float)
+        real = [i for i, k in enumerate(self._row_keys) if k is not None]
+        if costs.shape != (len(real),):
+            raise ValueError("Column costs must have one entry per row")
+        if not np.all(np.isfinite(costs)):
+            raise ValueError("Costs must be finite")
+        col = np.zeros(len(self._row_keys))
+        col[real] = costs
+        return col
+
+    def _build(self, cost_matrix, row_keys, col_keys):
+        """Solve from scratch, used when there is no previous assignment worth reusing."""
+        n_rows, n_cols = cost_matrix.shape
+        n = max(n_rows, n_cols)
+        if n == 0:
+            self.__init__()
+            return
+        self._cost = np.zeros((n, n))
+        self._cost[:n_rows, :n_cols] = cost_matrix
+        self._row_keys = row_keys + [None] * (n - n_rows)
+        self._col_keys = col_keys + [None] * (n - n_cols)
+        self._row_index = {key: i for i, key in enumerate(row_keys)}
+        self._col_index = {key: j for j, key in enumerate(col_keys)}
+
+        self._col4row = np.full(n, -1)
+        self._row4col = np.full(n, -1)
+        _, col4row = linear_sum_assignment(self._cost)
+        if self._recover_duals(col4row):
+            self._col4row = col4row
+            self._row4col[col4row] = np.arange(n)
+        else:
+            # Column reduction gives feasible duals to augment every row from
+            self._u = np.zeros(n)
+            self._v = self._cost.min(axis=0)
+            self._repair()
+        self._synced = (cost_matrix, row_keys, col_keys)
+
+    def _recover_duals(self, col4row, max_passes=50):
+        """Find potentials that make an optimal assignment tight, returning False if that takes too long.
+
+        Alternately tightening the assigned pairs and restoring feasibility is a
+        Bellman-Ford pass over the residual graph; an optimal assignment leaves no
+        negative cycles, so it settles, usually within a few passes.
+        """
+        assigned = self._cost[np.arange(len(col4row)), col4row]
+        v = self._cost.min(axis=0)
+        for _ in range(max_passes):
+            u = assigned - v[col4row]
+            new_v = (self._cost - u[:, None]).min(axis=0)
+            if np.array_equal(new_v, v):
+                self._u, self._v = u, v
+                return True
+            v = new_v
+        return False
+
+    def _grow(self):
+        """Append a dummy row and a dummy column, keeping the duals feasible."""
+        n = len(self._row_keys)
+        cost = np.zeros((n + 1, n + 1))
+        cost[:n, :n] = self._cost
+        self._cost = cost
+        self._row_keys.append(None)
+        self._col_keys.append(None)
+        self._v = np.append(self._v, np.min(-self._u) if n else 0.0)
+        self._u = np.append(self._u, np.min(cost[n] - self._v))
+        self._col4row = np.append(self._col4row, -1)
+        self._row4col = np.append(self._row4col, -1)
+        return n
+
+    def _set_row(self, i, row):
+        j = self._col4row[i]
+        if j >= 0:
+            self._row4col[j] = -1
+            self._col4row[i] = -1
+        self._cost[i] = row
+        self._u[i] = np.min(row - self._v)
+
+    def _set_col(self, j, col):
+        i = self._row4col[j]
+        if i >= 0:
+            self._col4row[i] = -1
+            self._row4col[j] = -1
+        self._cost[:, j] = col
+        self._v[j] = np.min(col - self._u)
+
+    def _compact(self):
+        """Drop pairs of dummy rows and columns so the matrix stays minimal."""
+        dummy_rows = [i for i, k in enumerate(self._row_keys) if k is None]
+        dummy_cols = [j for j, k in enumerate(self._col_keys) if k is None]
+        # Drop from the back so the remaining dummy positions stay valid
+        for i, j in sorted(zip(dummy_rows, dummy_cols), reverse=True):
+            self._drop(i, j)
+
+    def _drop(self, i, j):
+        """Remove dummy row ``i`` and dummy column ``j``, freeing whatever they were matched to."""
+        if self._col4row[i] >= 0:
+            self._row4col[self._col4row[i]] = -1
+            self._col4row[i] = -1
+        if self._row4col[j] >= 0:
+            self._col4row[self._row4col[j]] = -1
+            self._row4col[j] = -1
+
+        # Swap the pair to the end and shrink to a view instead of copying the matrix
+        last = len(self._row_keys) - 1
+        if i != last:
+            self._cost[[i, last]] = self._cost[[last, i]]
+            self._u[[i, last]] = self._u[[last, i]]
+            self._col4row[[i, last]] = self._col4row[[last, i]]
+            self._row_keys[i], self._row_keys[last] = self._row_keys[last], self._row_keys[i]
+            if self._col4row[i] >= 0:
+                self._row4col[self._col4row[i]] = i
+            if self._row_keys[i] is not None:
+                self._row_index[self._row_keys[i]] = i
+        if j != last:
+            self._cost[:, [j, last]] = self._cost[:, [last, j]]
+            self._v[[j, last]] = self._v[[last, j]]
+            self._row4col[[j, last]] = self._row4col[[last, j]]
+            self._col_keys[j], self._col_keys[last] = self._col_keys[last], self._col_keys[j]
+            if self._row4col[j] >= 0:
+                self._col4row[self._row4col[j]] = j
+            if self._col_keys[j] is not None:
+                self._col_index[self._col_keys[j]] = j
+
+        self._cost = self._cost[:last, :last]
+        self._u = self._u[:last]
+        self._v = self._v[:last]
+        self._col4row = self._col4row[:last]
+        self._row4col = self._row4col[:last]
+        self._row_keys.pop()
+        self._col_keys.pop()
+
+    def _repair(self):
+        """Re-match every free row along a shortest augmenting path."""
+        for i in np.flatnonzero(self._col4row < 0):
+            # Dropping a free row's potential to its tightest edge keeps the duals feasible
+            self._u[i] = np.min(self._cost[i] - self._v)
+            self._augment(i)
+
+    def _augment(self, start):
+        """Dijkstra-style shortest augmenting path from a free row (as in scipy's LAPJV)."""
+        n = len(self._row_keys)
+        cost, u, v = self._cost, self._u, self._v
+        path = np.full(n, -1)
+        shortest = np.full(n, np.inf)
+        remaining = np.ones(n, dtype=bool)
+        scanned_rows = np.zeros(n, dtype=bool)
+
+        i = start
+        min_val = 0.0
+        while True:
+            scanned_rows[i] = True
+            reduced = min_val + cost[i] - u[i] - v
+            better = remaining & (reduced < shortest)
+            shortest[better] = reduced[better]
+            path[better] = i
+
+            candidates = np.where(remaining, shortest, np.inf)
+            lowest = candidates.min()
+            tied = np.flatnonzero(candidates == lowest)
+            free = tied[self._row4col[tied] < 0]
+            j = free[0] if len(free) else tied[0]
+
+            min_val = lowest
+            remaining[j] = False
+            if self._row4col[j] < 0:
+                sink = j
+                break
+            i = self._row4col[j]
+
+        # Update the duals so the new path is tight and all reduced costs stay non-negative
+        u[start] += min_val
+        others = scanned_rows.copy()
+        others[start] = False
+        u[others] += min_val - shortest[self._col4row[others]]
+        scanned_cols = ~remaining
+        v[scanned_cols] -= min_val - shortest[scanned_cols]
+
+        j = sink
+        while True:
+            i = path[j]
+            self._row4col[j] = i
+            self._col4row[i], j = j, self._col4row[i]
+            if i == start:
+                break
@@ -14,8 +14,10 @@ import seaborn as sns
 from datetime import datetime
 from scipy.optimize import linear_sum_assignment
 import os
+import zlib
 import base64
-from io import BytesIO
+from io import BytesIO, StringIO
+from incremental_assignment import IncrementalAssignment
 
 class ResumeMatchingSystem:
     def __init__(self):
@@ -24,6 +26,9 @@ class ResumeMatchingSystem:
         self.skill_graph = nx.DiGraph()
         self.suitability_matrix = None
         self.min_score_threshold = 5  # Default threshold
+        self._data_version = 0  # Bumped on every change that affects scores
+        self._scored_version = None  # Data version the suitability matrix was calculated from
+        self.incremental_matcher = IncrementalAssignment()  # Keeps the last assignment for warm starts
 
     def add_candidate(self, candidate_id, name, skills, experience_years=0, salary_expectation=None, application_date=None):
         """Add a candidate with skills, experience, and salary expectation."""
@@ -36,6 +41,7 @@ class ResumeMatchingSystem:
             'application_date': application_date if application_date else datetime.now()
         }
         self.candidates.append(candidate)
+        self._data_version += 1
 
         for skill in skills.keys():
             if not self.skill_graph.has_node(skill):
@@ -45,18 +51,78 @@ class ResumeMatchingSystem:
 
     def save_suitability_to_csv(self, filename="suitability_scores.csv"):
         """Save the candidate-job suitability matrix as a CSV file."""
-        if self.suitability_matrix is None:
-            self.calculate_suitability_scores()
+        with open(filename, mode='w', encoding='utf-8', newline='') as file:
+            for chunk in self.iter_suitability_export(fmt='csv'):
+                file.write(chunk)
+        print(f"Suitability scores saved to {filename}")
 
-        candidate_labels = [f"{c['name']} ({c['id']})" for c in self.candidates]
-        job_labels = [f"{j['title']} ({j['id']})" for j in self.jobs]
+    def iter_suitability_export(self, fmt='csv', threshold=None, block_size=256, compress=False):
+        """Yield the suitability matrix in row blocks as CSV, NDJSON or sparse CSV rows.
+
+        Only one block of rows is formatted at a time, so memory stays bounded
+        regardless of the matrix size. The sparse format writes (candidate_id, job_id,
+        score) rows for pairs scoring at least ``threshold`` (the minimum score
+        threshold by default). With ``compress=True`` the chunks are gzip-compressed bytes.
+        """
+        if fmt not in ('csv', 'ndjson', 'sparse'):
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if self._scores_are_stale():
+            self.calculate_suitability_scores()
+        if threshold is None:
+            threshold = self.min_score_threshold
+
+        # Hold on to the current data so a concurrent recalculation can't change it mid-stream
+        matrix = self.suitability_matrix
+        candidates = list(self.candidates)
+        jobs = list(self.jobs)
+
+        chunks = self._iter_suitability_blocks(matrix, candidates, jobs, fmt, threshold, block_size)
+        if compress:
+            chunks = self._gzip_chunks(chunks)
+        return chunks
+
+    def _iter_suitability_blocks(self, matrix, candidates, jobs, fmt, threshold, block_size):
+        buf = StringIO()
+        writer = csv.writer(buf, lineterminator='\n')
+
+        if fmt == 'csv':
+            writer.writerow([''] + [f"{j['title']} ({j['id']})" for j in jobs])
+        elif fmt == 'sparse':
+            writer.writerow(['candidate_id', 'job_id', 'score'])
+
+        for start in range(0, len(candidates), block_size):
+            block = matrix[start:start + block_size]
+
+            if fmt == 'csv':
+                for offset, row in enumerate(block):
+                    c = candidates[start + offset]
+                    writer.writerow([f"{c['name']} ({c['id']})"] + row.tolist())
+            elif fmt == 'ndjson':
+                for offset, row in enumerate(block):
+                    c = candidates[start + offset]
+                    record = {
+                        'candidate_id': c['id'],
+                        'candidate_name': c['name'],
+                        'scores': {str(j['id']): score for j, score in zip(jobs, row.tolist())}
+                    }
+                    buf.write(json.dumps(record) + '\n')
+            else:
+                rows, cols = np.nonzero(block >= threshold)
+                for i, j in zip(rows.tolist(), cols.tolist()):
+                    writer.writerow([candidates[start + i]['id'], jobs[j]['id'], float(block[i, j])])
 
-        # Convert matrix to DataFrame
-        df = pd.DataFrame(self.suitability_matrix, index=candidate_labels, columns=job_labels)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
 
-        # Save to CSV
-        df.to_csv(filename, index=True)
-        print(f"Suitability scores saved to {filename}")
+    @staticmethod
+    def _gzip_chunks(chunks):
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
 
     def add_job(self, job_id, title, required_skills, importance_weights=None, salary_range=None):
         """Add a job with required skills, weights, and salary range."""
@@ -71,6 +137,7 @@ class ResumeMatchingSystem:
             'salary_range': salary_range
         }
         self.jobs.append(job)
+        self._data_version += 1
 
         for skill in required_skills:
             if not self.skill_graph.has_node(skill):
@@ -78,6 +145,24 @@ class ResumeMatchingSystem:
 
         return job_id
 
+    def remove_candidate(self, candidate_id):
+        """Remove the candidate with the given ID, returning whether one was found."""
+        for i, candidate in enumerate(self.candidates):
+            if candidate['id'] == candidate_id:
+                self.candidates.pop(i)
+                self._data_version += 1
+                return True
+        return False
+
+    def remove_job(self, job_id):
+        """Remove the job with the given ID, returning whether one was found."""
+        for i, job in enumerate(self.jobs):
+            if job['id'] == job_id:
+                self.jobs.pop(i)
+                self._data_version += 1
+                return True
+        return False
+
     def add_skill_relationship(self, skill1, skill2, weight=1.0):
         """Add an edge between two skills in the skill graph with a weight."""
         if not self.skill_graph.has_node(skill1):
@@ -85,6 +170,7 @@ class ResumeMatchingSystem:
         if not self.skill_graph.has_node(skill2):
             self.skill_graph.add_node(skill2)
         self.skill_graph.add_edge(skill1, skill2, weight=weight)
+        self._data_version += 1
 
     def calculate_suitability_scores(self):
         """Calculate scores using skills, experience, salary, and skill relationships."""
@@ -94,6 +180,7 @@ class ResumeMatchingSystem:
         n_candidates = len(self.candidates)
         n_jobs = len(self.jobs)
         self.suitability_matrix = np.zeros((n_candidates, n_jobs))
+        self._scored_version = self._data_version
 
         for i, candidate in enumerate(self.candidates):
             for j, job in enumerate(self.jobs):
@@ -132,74 +219,57 @@ class ResumeMatchingSystem:
 
     def find_optimal_matches(self):
         """Find optimal matches between candidates and jobs."""
-        if self.suitability_matrix is None:
+        if self._scores_are_stale():
             self.calculate_suitability_scores()
 
-        # Create a working copy of the suitability matrix
-        cost_matrix = -self.suitability_matrix.copy()
-        
-        # Create a mask for scores below threshold
-        below_threshold = self.suitability_matrix < self.min_score_threshold
-        
-        # For the Hungarian algorithm, set below-threshold values to infinity
-        cost_matrix_filtered = cost_matrix.copy()
-        cost_matrix_filtered[below_threshold] = np.inf
-        
-        # Store the original shape for reference
-        n_candidates, n_jobs = cost_matrix.shape
-        
-        # Attempt to find optimal assignments considering the threshold
-        try:
-            candidate_indices, job_indices = linear_sum_assignment(cost_matrix_filtered)
-            
-            # Filter out assignments that were forced but are actually below threshold
-            matches = []
-            for cand_idx, job_idx in zip(candidate_indices, job_indices):
-                score = self.suitability_matrix[cand_idx, job_idx]
-                if score >= self.min_score_threshold:
-                    matches.append({
-                        'candidate': self.candidates[cand_idx],
-                        'job': self.jobs[job_idx],
-                        'score': score
-                    })
-            
-            return matches
-        
-        except ValueError:
-            # If the filtered matrix has all-infinite rows or columns, 
-            # we need to find partial matches
-            
-            # Find rows (candidates) and columns (jobs) that have at least one value above threshold
-            valid_candidates = ~np.all(below_threshold, axis=1)
-            valid_jobs = ~np.all(below_threshold, axis=0)
-            
-            # If we have any valid candidates and jobs, find matches among them
-            if np.any(valid_candidates) and np.any(valid_jobs):
-                # Extract the submatrix of valid candidates and jobs
-                sub_matrix = cost_matrix[np.ix_(valid_candidates, valid_jobs)]
-                
-                # Run the algorithm on the submatrix
-                sub_cand_indices, sub_job_indices = linear_sum_assignment(sub_matrix)
-                
-                # Map back to original indices
-                orig_cand_indices = np.where(valid_candidates)[0][sub_cand_indices]
-                orig_job_indices = np.where(valid_jobs)[0][sub_job_indices]
-                
-                # Create matches for assignments above threshold
-                matches = []
-                for cand_idx, job_idx in zip(orig_cand_indices, orig_job_indices):
-                    score = self.suitability_matrix[cand_idx, job_idx]
-                    if score >= self.min_score_threshold:
-                        matches.append({
-                            'candidate': self.candidates[cand_idx],
-                            'job': self.jobs[job_idx],
-                            'score': score
-                        })
-                
-                return matches
-            else:
-                # No valid matches possible
-                return []
+        candidate_indices, job_indices = linear_sum_assignment(-self._thresholded_scores())
+        return self._build_matches(zip(candidate_indices, job_indices))
+
+    def find_incremental_matches(self):
+        """Find optimal matches, repairing the previous assignment instead of re-solving it.
+
+        Gives the same total score as find_optimal_matches, but only the candidates
+        and jobs that were added, removed or rescored since the last call are re-matched.
+        """
+        if self._scores_are_stale():
+            self.calculate_suitability_scores()
+
+        candidate_ids = [c['id'] for c in self.candidates]
+        job_ids = [j['id'] for j in self.jobs]
+        if len(set(candidate_ids)) != len(candidate_ids) or len(set(job_ids)) != len(job_ids):
+            # Duplicate IDs can't be tracked between calls, fall back to a full solve
+            self.incremental_matcher = IncrementalAssignment()
+            return self.find_optimal_matches()
+
+        self.incremental_matcher.sync(-self._thresholded_scores(), candidate_ids, job_ids, copy=False)
+
+        candidate_index = {cid: i for i, cid in enumerate(candidate_ids)}
+        job_index = {jid: j for j, jid in enumerate(job_ids)}
+        pairs = [(candidate_index[cand_id], job_index[job_id])
+                 for cand_id, job_id in self.incremental_matcher.assignment()]
+
+        # Keep the candidate order of find_optimal_matches for the report
+        return self._build_matches(sorted(pairs))
+
+    def _scores_are_stale(self):
+        # A deleted and an added candidate keep the shape but not the scores, so compare versions
+        return self.suitability_matrix is None or self._scored_version != self._data_version
+
+    def _thresholded_scores(self):
+        # Scores below the threshold add nothing, so those pairs can simply stay unmatched
+        return np.where(self.suitability_matrix >= self.min_score_threshold, self.suitability_matrix, 0)
+
+    def _build_matches(self, pairs):
+        matches = []
+        for cand_idx, job_idx in pairs:
+            score = self.suitability_matrix[cand_idx, job_idx]
+            if score >= self.min_score_threshold:
+                matches.append({
+                    'candidate': self.candidates[cand_idx],
+                    'job': self.jobs[job_idx],
+                    'score': score
+                })
+        return matches
 
     def generate_report(self, matches=None):
         """Generate a detailed report of the matches."""
@@ -451,6 +521,55 @@ class ResumeMatchingSystem:
         except Exception as e:
             print(f"Error loading jobs: {e}")
 
+    def save_candidates_to_csv(self, filename, candidates=None):
+        """Save candidates to CSV, replacing the file atomically."""
+        if candidates is None:
+            candidates = self.candidates
+
+        serialized_candidates = []
+        for candidate in candidates:
+            c = candidate.copy()
+            # Convert datetime to string and skills to JSON string
+            c['application_date'] = c['application_date'].strftime('%Y-%m-%d %H:%M:%S')
+            c['skills'] = json.dumps(c['skills'])
+            serialized_candidates.append(c)
+
+        columns = ['id', 'name', 'skills', 'experience_years', 'salary_expectation', 'application_date']
+        self._replace_csv(filename, pd.DataFrame(serialized_candidates, columns=columns))
+
+    def save_jobs_to_csv(self, filename, jobs=None):
+        """Save jobs to CSV, replacing the file atomically."""
+        if jobs is None:
+            jobs = self.jobs
+
+        jobs_data = []
+        for job in jobs:
+            job_dict = job.copy()
+            job_dict['required_skills'] = json.dumps(job_dict['required_skills'])
+            job_dict['importance_weights'] = json.dumps(job_dict['importance_weights'])
+            job_dict['salary_range'] = str(job_dict['salary_range'])
+            jobs_data.append(job_dict)
+
+        columns = ['id', 'title', 'required_skills', 'importance_weights', 'salary_range']
+        self._replace_csv(filename, pd.DataFrame(jobs_data, columns=columns))
+
+    def save_skill_relationships_to_csv(self, filename, edges=None):
+        """Save skill relationships as (skill1, skill2, weight) rows, replacing the file atomically."""
+        if edges is None:
+            edges = list(self.skill_graph.edges(data='weight', default=1.0))
+
+        self._replace_csv(filename, pd.DataFrame(edges, columns=['skill1', 'skill2', 'weight']))
+
+    @staticmethod
+    def _replace_csv(filename, df):
+        # Write next to the target first so a crash never leaves a half-written file
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, mode='w', encoding='utf-8', newline='') as file:
+            df.to_csv(file, index=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_filename, filename)
+
     def get_all_skills(self):
         """Return a list of all skills in the system."""
         return list(self.skill_graph.nodes())
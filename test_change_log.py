@@ -0,0 +1,204 @@
+import os
+import shutil
+
+import pytest
+
+from change_log import ChangeLog
+from matching_system import ResumeMatchingSystem
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+SNAPSHOT_FILES = ('candidates.csv', 'jobs.csv', 'skills.csv')
+
+
+def copy_data(tmp_path):
+    for name in SNAPSHOT_FILES:
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path / name)
+
+
+def open_log(tmp_path, **kwargs):
+    return ChangeLog(str(tmp_path / 'changes.log'), *(str(tmp_path / name) for name in SNAPSHOT_FILES), **kwargs)
+
+
+def restart(tmp_path, **kwargs):
+    # Same order as app.py: load the snapshot, then replay the log on top of it
+    system = ResumeMatchingSystem()
+    system.load_candidates_from_csv(str(tmp_path / 'candidates.csv'))
+    system.load_jobs_from_csv(str(tmp_path / 'jobs.csv'))
+    system.load_skill_relationships_from_csv(str(tmp_path / 'skills.csv'))
+    change_log = open_log(tmp_path, **kwargs)
+    change_log.replay(system)
+    return system, change_log
+
+
+def state(system):
+    candidates = sorted((c['id'], c['name'], tuple(sorted(c['skills'].items()))) for c in system.candidates)
+    jobs = sorted((j['id'], j['title'], tuple(j['required_skills'])) for j in system.jobs)
+    edges = sorted((u, v, w) for u, v, w in system.skill_graph.edges(data='weight', default=1.0))
+    return candidates, jobs, edges
+
+
+def add_candidate(change_log, system, candidate_id, name='Test Candidate'):
+    change_log.append_and_apply(system, 'add_candidate', {
+        'id': candidate_id, 'name': name, 'skills': {'Python': 4, 'SQL': 3},
+        'experience_years': 3, 'salary_expectation': 70000.0,
+        'application_date': '2024-01-02 03:04:05',
+    })
+
+
+def add_job(change_log, system, job_id, title='Test Job'):
+    change_log.append_and_apply(system, 'add_job', {
+        'id': job_id, 'title': title, 'required_skills': ['Python'],
+        'importance_weights': {'Python': 2.0}, 'salary_range': [50000.0, 90000.0],
+    })
+
+
+def test_compaction_and_crash_recovery(tmp_path):
+    copy_data(tmp_path)
+    system, change_log = restart(tmp_path)
+    first_candidate = system.candidates[0]['id']
+
+    add_candidate(change_log, system, 9001)
+    add_job(change_log, system, 9101)
+    change_log.append_and_apply(system, 'delete_candidate', {'id': first_candidate})
+    assert change_log.compact(system)
+    change_log.wait_for_compaction()
+    assert not os.path.exists(change_log.old_path)
+    assert os.path.getsize(change_log.path) == 0
+
+    add_candidate(change_log, system, 9002)
+    change_log.append_and_apply(system, 'delete_job', {'id': 9101})
+    change_log.append_and_apply(system, 'add_skill_relationship',
+                                {'skill1': 'Python', 'skill2': 'Rust', 'weight': 0.4})
+    change_log.sync()
+    # Crash: the log is abandoned without being closed
+    expected = state(system)
+
+    recovered, recovered_log = restart(tmp_path)
+    assert state(recovered) == expected
+    assert first_candidate not in {c['id'] for c in recovered.candidates}
+    recovered_log.close()
+    change_log.close()
+
+
+def test_replay_skips_torn_final_line(tmp_path):
+    copy_data(tmp_path)
+    system, change_log = restart(tmp_path)
+    add_candidate(change_log, system, 9001)
+    add_candidate(change_log, system, 9002)
+    change_log.close()
+
+    # A crash mid-append leaves the last change cut short
+    with open(change_log.path, 'rb+') as file:
+        file.truncate(os.path.getsize(change_log.path) - 20)
+
+    recovered, recovered_log = restart(tmp_path)
+    ids = {c['id'] for c in recovered.candidates}
+    assert 9001 in ids and 9002 not in ids
+
+    # The next change starts on a fresh line instead of being glued onto the torn one
+    add_candidate(recovered_log, recovered, 9003)
+    recovered_log.close()
+    again, again_log = restart(tmp_path)
+    ids = {c['id'] for c in again.candidates}
+    assert {9001, 9003} <= ids and 9002 not in ids
+    again_log.close()
+
+
+def test_leftover_rotated_log_is_replayed_and_compacted(tmp_path):
+    copy_data(tmp_path)
+    system, change_log = restart(tmp_path)
+    add_candidate(change_log, system, 9001, name='Old Name')
+    change_log.close()
+    # A crash during compaction leaves the rotated log next to a stale snapshot
+    os.replace(change_log.path, change_log.old_path)
+
+    system, change_log = restart(tmp_path)
+    add_candidate(change_log, system, 9002)
+    change_log.append_and_apply(system, 'delete_candidate', {'id': 9001})
+    add_candidate(change_log, system, 9001, name='New Name')
+    expected = state(system)
+
+    # The leftover log is kept ahead of the current one, so later changes win on replay
+    change_log.close()
+    recovered, recovered_log = restart(tmp_path)
+    assert state(recovered) == expected
+    assert [c['name'] for c in recovered.candidates if c['id'] == 9001] == ['New Name']
+
+    assert recovered_log.compact(recovered)
+    recovered_log.wait_for_compaction()
+    assert not os.path.exists(recovered_log.old_path)
+    recovered_log.close()
+    compacted, compacted_log = restart(tmp_path)
+    assert state(compacted) == expected
+    compacted_log.close()
+
+
+def test_duplicate_ids_are_rejected_before_logging(tmp_path):
+    copy_data(tmp_path)
+    system, change_log = restart(tmp_path)
+    candidate_id = system.candidates[0]['id']
+    job_id = system.jobs[0]['id']
+    expected = state(system)
+
+    with pytest.raises(ValueError):
+        add_candidate(change_log, system, candidate_id)
+    with pytest.raises(ValueError):
+        add_job(change_log, system, job_id)
+    assert state(system) == expected
+    assert os.path.getsize(change_log.path) == 0
+    change_log.close()
+
+
+def test_log_is_compacted_once_it_outgrows_snapshot(tmp_path):
+    copy_data(tmp_path)
+    system, change_log = restart(tmp_path, min_compact_bytes=0, compact_ratio=0.05)
+    threshold = 0.05 * sum(os.path.getsize(tmp_path / name) for name in SNAPSHOT_FILES)
+
+    candidate_id = 9000
+    while change_log._compaction is None:
+        assert os.path.getsize(change_log.path) < threshold
+        candidate_id += 1
+        add_candidate(change_log, system, candidate_id)
+    change_log.wait_for_compaction()
+    assert not os.path.exists(change_log.old_path)
+    assert os.path.getsize(change_log.path) == 0
+    change_log.close()
+
+    # A count limit triggers a compaction regardless of size
+    system, change_log = restart(tmp_path, compact_every=3)
+    for _ in range(2):
+        candidate_id += 1
+        add_candidate(change_log, system, candidate_id)
+    assert change_log._compaction is None
+    candidate_id += 1
+    add_candidate(change_log, system, candidate_id)
+    change_log.wait_for_compaction()
+    assert os.path.getsize(change_log.path) == 0
+    expected = state(system)
+    change_log.close()
+
+    recovered, recovered_log = restart(tmp_path)
+    assert state(recovered) == expected
+    recovered_log.close()
+
+
+def test_failed_compaction_leaves_log_writable(tmp_path, monkeypatch):
+    copy_data(tmp_path)
+    system, change_log = restart(tmp_path)
+    add_candidate(change_log, system, 9001)
+
+    def failing_replace(src, dst):
+        raise OSError('disk full')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, 'replace', failing_replace)
+        with pytest.raises(OSError):
+            change_log.compact(system)
+
+    add_candidate(change_log, system, 9002)
+    expected = state(system)
+    change_log.close()
+
+    recovered, recovered_log = restart(tmp_path)
+    assert state(recovered) == expected
+    recovered_log.close()
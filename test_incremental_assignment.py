@@ -0,0 +1,95 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from incremental_assignment import IncrementalAssignment
+
+
+def check_against_cold_solve(matcher, cost_matrix, row_keys, col_keys):
+    pairs = matcher.assignment()
+
+    # Every real row and column is used at most once, and as many pairs as possible are made
+    assert len({row for row, _ in pairs}) == len(pairs)
+    assert len({col for _, col in pairs}) == len(pairs)
+    assert len(pairs) == min(len(row_keys), len(col_keys))
+
+    if not pairs:
+        assert matcher.total_cost() == 0.0
+        return
+    rows, cols = linear_sum_assignment(cost_matrix)
+    expected = cost_matrix[rows, cols].sum()
+    row_index = {key: i for i, key in enumerate(row_keys)}
+    col_index = {key: j for j, key in enumerate(col_keys)}
+    actual = sum(cost_matrix[row_index[row], col_index[col]] for row, col in pairs)
+    assert np.isclose(actual, expected)
+    assert np.isclose(matcher.total_cost(), expected)
+
+
+def random_costs(rng, shape, integer):
+    # Integer costs produce plenty of ties, which exercise the tie-breaking paths
+    if integer:
+        return -rng.integers(0, 20, shape).astype(float)
+    return rng.normal(size=shape)
+
+
+def test_sync_matches_cold_solve_on_random_edits():
+    for seed in range(100):
+        rng = np.random.default_rng(seed)
+        integer = seed % 2 == 0
+        matcher = IncrementalAssignment()
+        row_keys = list(range(rng.integers(0, 6)))
+        col_keys = list(range(100, 100 + rng.integers(0, 6)))
+        cost_matrix = random_costs(rng, (len(row_keys), len(col_keys)), integer)
+        next_key = 1000
+
+        for _ in range(30):
+            matcher.sync(cost_matrix, row_keys, col_keys)
+            check_against_cold_solve(matcher, cost_matrix, row_keys, col_keys)
+
+            op = rng.integers(6)
+            if op == 0:
+                row_keys.append(next_key)
+                cost_matrix = np.vstack([cost_matrix, random_costs(rng, (1, len(col_keys)), integer)])
+                next_key += 1
+            elif op == 1:
+                col_keys.append(next_key)
+                cost_matrix = np.hstack([cost_matrix, random_costs(rng, (len(row_keys), 1), integer)])
+                next_key += 1
+            elif op == 2 and row_keys:
+                i = rng.integers(len(row_keys))
+                row_keys.pop(i)
+                cost_matrix = np.delete(cost_matrix, i, axis=0)
+            elif op == 3 and col_keys:
+                j = rng.integers(len(col_keys))
+                col_keys.pop(j)
+                cost_matrix = np.delete(cost_matrix, j, axis=1)
+            elif op == 4 and row_keys:
+                cost_matrix = cost_matrix.copy()
+                cost_matrix[rng.integers(len(row_keys))] = random_costs(rng, len(col_keys), integer)
+            elif op == 5 and col_keys:
+                cost_matrix = cost_matrix.copy()
+                cost_matrix[:, rng.integers(len(col_keys))] = random_costs(rng, len(row_keys), integer)
+
+
+def test_sync_handles_empty_matrix():
+    matcher = IncrementalAssignment()
+    matcher.sync(np.zeros((0, 0)), [], [])
+    assert matcher.assignment() == []
+
+    matcher.sync(np.array([[-3.0, -1.0], [-2.0, -4.0]]), ['a', 'b'], ['x', 'y'])
+    assert sorted(matcher.assignment()) == [('a', 'x'), ('b', 'y')]
+
+    # Removing everything and starting over goes back through a cold build
+    matcher.sync(np.zeros((0, 0)), [], [])
+    assert matcher.assignment() == []
+    matcher.sync(np.array([[-1.0]]), ['c'], ['z'])
+    assert matcher.assignment() == [('c', 'z')]
+
+
+def test_build_falls_back_to_augmenting_paths():
+    rng = np.random.default_rng(7)
+    cost_matrix = rng.normal(size=(12, 9))
+    matcher = IncrementalAssignment()
+    # Pretend recovering the duals didn't settle, so every row is augmented instead
+    matcher._recover_duals = lambda col4row: False
+    matcher.sync(cost_matrix, range(12), range(9))
+    check_against_cold_solve(matcher, cost_matrix, list(range(12)), list(range(9)))
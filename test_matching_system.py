@@ -0,0 +1,108 @@
+import csv
+import gzip
+import io
+import json
+import os
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from matching_system import ResumeMatchingSystem
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def load_system():
+    system = ResumeMatchingSystem()
+    system.load_candidates_from_csv(os.path.join(DATA_DIR, 'candidates.csv'))
+    system.load_jobs_from_csv(os.path.join(DATA_DIR, 'jobs.csv'))
+    system.load_skill_relationships_from_csv(os.path.join(DATA_DIR, 'skills.csv'))
+    return system
+
+
+def cold_total(system):
+    scores = system.suitability_matrix
+    gain = np.where(scores >= system.min_score_threshold, scores, 0)
+    rows, cols = linear_sum_assignment(-gain)
+    return gain[rows, cols].sum()
+
+
+def check_matches(system, matches):
+    # Compare records rather than IDs, which aren't guaranteed to be unique
+    assert len({id(m['candidate']) for m in matches}) == len(matches)
+    assert len({id(m['job']) for m in matches}) == len(matches)
+    assert all(m['score'] >= system.min_score_threshold for m in matches)
+    assert np.isclose(sum(m['score'] for m in matches), cold_total(system))
+
+
+def test_incremental_matches_equal_cold_solve_across_edits():
+    system = load_system()
+    rng = np.random.default_rng(0)
+
+    for threshold in (5, 40, 20):
+        system.set_min_score(threshold)
+        system.calculate_suitability_scores()
+        incremental = system.find_incremental_matches()
+        check_matches(system, incremental)
+        optimal = system.find_optimal_matches()
+        assert np.isclose(sum(m['score'] for m in optimal), sum(m['score'] for m in incremental))
+
+    for step in range(10):
+        if step % 3 == 0:
+            system.remove_candidate(system.candidates[rng.integers(len(system.candidates))]['id'])
+        elif step % 3 == 1:
+            system.add_candidate(1000 + step, f"New {step}", {'python': 8, 'sql': 6}, 4, 60000)
+        else:
+            system.remove_job(system.jobs[rng.integers(len(system.jobs))]['id'])
+        system.calculate_suitability_scores()
+        check_matches(system, system.find_incremental_matches())
+
+
+def test_incremental_matches_fall_back_on_duplicate_ids():
+    system = load_system()
+    system.add_candidate(system.candidates[0]['id'], "Duplicate", {'python': 9}, 5, 50000)
+    system.calculate_suitability_scores()
+    check_matches(system, system.find_incremental_matches())
+
+
+def read_export(system, **kwargs):
+    return ''.join(system.iter_suitability_export(block_size=7, **kwargs))
+
+
+def test_export_formats_match_suitability_matrix():
+    system = load_system()
+    scores = system.calculate_suitability_scores()
+
+    rows = list(csv.reader(io.StringIO(read_export(system, fmt='csv'))))
+    assert rows[0][1:] == [f"{j['title']} ({j['id']})" for j in system.jobs]
+    assert [row[0] for row in rows[1:]] == [f"{c['name']} ({c['id']})" for c in system.candidates]
+    assert np.array_equal(np.array([row[1:] for row in rows[1:]], dtype=float), scores)
+
+    records = [json.loads(line) for line in read_export(system, fmt='ndjson').splitlines()]
+    assert [r['candidate_id'] for r in records] == [c['id'] for c in system.candidates]
+    for record, row in zip(records, scores):
+        assert record['scores'] == {str(j['id']): s for j, s in zip(system.jobs, row.tolist())}
+
+    rows = list(csv.DictReader(io.StringIO(read_export(system, fmt='sparse', threshold=30))))
+    candidate_index = {c['id']: i for i, c in enumerate(system.candidates)}
+    job_index = {j['id']: k for k, j in enumerate(system.jobs)}
+    assert len(rows) == np.count_nonzero(scores >= 30)
+    for row in rows:
+        score = scores[candidate_index[int(row['candidate_id'])], job_index[int(row['job_id'])]]
+        assert float(row['score']) == score >= 30
+
+    for fmt in ('csv', 'ndjson', 'sparse'):
+        compressed = b''.join(system.iter_suitability_export(fmt=fmt, block_size=7, compress=True))
+        assert gzip.decompress(compressed).decode('utf-8') == read_export(system, fmt=fmt)
+
+
+def test_export_recalculates_after_data_changes():
+    system = load_system()
+    system.calculate_suitability_scores()
+    # Same shape as before, but the last row now belongs to a different candidate
+    system.remove_candidate(system.candidates[0]['id'])
+    system.add_candidate(2000, "Weak", {}, 0, 10 ** 7)
+
+    rows = list(csv.reader(io.StringIO(read_export(system, fmt='csv'))))
+    assert rows[-1][0] == "Weak (2000)"
+    assert all(float(score) == 0 for score in rows[-1][1:])